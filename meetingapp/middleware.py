@@ -11,37 +11,99 @@ For production, consider a one-time nonce approach:
   3. Consumer validates nonce and discards it
 This MVP uses direct JWT in query param for simplicity.
 """
-from urllib.parse import parse_qs
+import hashlib
+import time
+from collections import OrderedDict
+from urllib.parse import unquote_plus
 
 from channels.db import database_sync_to_async
 from channels.middleware import BaseMiddleware
+# Module-level model imports are safe: asgi.py calls django.setup() before it
+# imports this module, so the app registry is ready.
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from rest_framework_simplejwt.tokens import AccessToken
+
+from meetings.room_tokens import read_room_token
+
+User = get_user_model()
+
+
+# Verified-token cache: sha256(token) -> (user, expires_at).
+# Reconnect storms replay the same token; a hit skips the signature check.
+# Entries live at most _USER_CACHE_TTL seconds and never outlive the token's
+# own `exp`. Only touched from the event loop, so no lock is needed.
+_USER_CACHE_MAX = 10_000
+_USER_CACHE_TTL = 10
+_user_cache = OrderedDict()
+
+
+def _cached_user(key):
+    entry = _user_cache.get(key)
+    if entry is None:
+        return None
+    user, expires_at = entry
+    if expires_at <= time.time():
+        del _user_cache[key]
+        return None
+    _user_cache.move_to_end(key)
+    return user
+
+
+def _cache_user(key, user, token_exp):
+    _user_cache[key] = (user, min(token_exp, time.time() + _USER_CACHE_TTL))
+    _user_cache.move_to_end(key)
+    if len(_user_cache) > _USER_CACHE_MAX:
+        _user_cache.popitem(last=False)
+
+
+def _query_param(query_string: bytes, name: bytes):
+    # Only two params are ever read; scan for them instead of building parse_qs' dict
+    prefix = name + b"="
+    for part in query_string.split(b"&"):
+        if part.startswith(prefix):
+            return unquote_plus(part[len(prefix):].decode()) or None
+    return None
 
 
 class JWTAuthMiddleware(BaseMiddleware):
     async def __call__(self, scope, receive, send):
-        scope["user"] = await self._get_user(scope)
+        query_string = scope.get("query_string", b"")
+        scope["user"] = await self._get_user(_query_param(query_string, b"token"))
+        # Optional ?room_token= from the join view; lets the consumer skip its access check
+        room_token = _query_param(query_string, b"room_token")
+        scope["room_claims"] = read_room_token(room_token) if room_token else None
         return await super().__call__(scope, receive, send)
 
-    @database_sync_to_async
-    def _get_user(self, scope):
-        # Lazy imports: Django app registry must be ready before importing models.
-        # These run inside a sync thread via database_sync_to_async, after setup().
-        from django.contrib.auth.models import AnonymousUser
-        from django.contrib.auth import get_user_model
-        from rest_framework_simplejwt.tokens import AccessToken
-
-        query_string = scope.get("query_string", b"").decode()
-        params = parse_qs(query_string)
-        token = params.get("token", [None])[0]
+    async def _get_user(self, token):
         if not token:
             return AnonymousUser()
+        key = hashlib.sha256(token.encode()).digest()
+        user = _cached_user(key)
+        if user is not None:
+            return user
         try:
-            User = get_user_model()
             validated = AccessToken(token)
-            return User.objects.get(id=validated["user_id"])
         except Exception:
             return AnonymousUser()
 
+        user_id = User._meta.pk.to_python(validated["user_id"])
+        username = validated.get("username")
+        if username is None:
+            # Token issued before the username claim was added: fetch the row
+            user = await self._fetch_user(user_id)
+            if user is None:
+                return AnonymousUser()
+        else:
+            # The consumer only reads id/username; build the user from claims
+            user = User(id=user_id, username=username)
+        _cache_user(key, user, validated["exp"])
+        return user
+
+    @database_sync_to_async
+    def _fetch_user(self, user_id):
+        return User.objects.filter(id=user_id).first()
+
 
 def JWTAuthMiddlewareStack(inner):
     return JWTAuthMiddleware(inner)
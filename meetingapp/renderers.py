@@ -0,0 +1,30 @@
+"""
+orjson-backed DRF renderer.
+
+orjson encodes dicts, lists, datetimes and UUIDs natively in Rust, so the
+list endpoints return values() rows without any per-item conversion. For the
+data these views return the bytes are the same as DRF's compact JSONRenderer:
+UTF-8, aware UTC datetimes with a trailing "Z", naive ones left without an
+offset, non-string dict keys turned into strings, and anything orjson doesn't
+know (lazy strings, Decimal, timedelta, ...) handed to DRF's own encoder.
+
+Where it differs: NaN/Infinity encode as null instead of raising, integers
+must fit in 64 bits, and an `indent` asked for by the client is ignored.
+"""
+import orjson
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+_fallback = JSONEncoder().default
+
+
+class ORJSONRenderer(BaseRenderer):
+    media_type = "application/json"
+    format = "json"
+    charset = None  # application/json is always UTF-8
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return orjson.dumps(data, default=_fallback, option=_ORJSON_OPTIONS)
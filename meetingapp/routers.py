@@ -0,0 +1,22 @@
+"""
+Database router for the optional read replica.
+
+Nothing is routed to the replica implicitly: the meeting list opts in with
+.using(READ_DB) (see meetings/views.py). Every other read stays on the
+primary, so access checks and join/leave/end never see replication lag. The
+router's job is to keep writes and migrations off the replica.
+"""
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return None  # primary, or the instance's own database for related lookups
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True  # same data on both databases
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
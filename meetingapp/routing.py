@@ -1,11 +1,12 @@
-from django.urls import re_path
+from django.urls import path
 from meetings import consumers
 
 # WebSocket URL patterns only.
-# Pattern: ws/meeting/<uuid>/
+# Pattern: ws/meeting/<uuid>/ — the uuid converter validates the id and hands the
+# consumer a uuid.UUID, matching the <uuid:meeting_id> REST routes.
 websocket_urlpatterns = [
-    re_path(
-        r"^ws/meeting/(?P<meeting_id>[0-9a-f-]{36})/$",
+    path(
+        "ws/meeting/<uuid:meeting_id>/",
         consumers.MeetingConsumer.as_asgi(),
     ),
 ]
@@ -1,7 +1,7 @@
 """
 Dev/test settings — no Docker required.
 Uses SQLite instead of PostgreSQL.
-Uses in-memory channel layer instead of Redis.
+Uses in-memory channel layer and cache instead of Redis.
 Everything else inherits from settings.py.
 
 Usage:
@@ -30,6 +30,13 @@ CHANNEL_LAYERS = {
     }
 }
 
+# ── In-memory cache (no Redis needed) ─────────────────────────────────────────
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
 # ── Relaxed CORS for local file:// and localhost ─────────────────────────────
 CORS_ALLOW_ALL_ORIGINS = True
 
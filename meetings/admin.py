@@ -6,7 +6,7 @@ from .models import Meeting, Participant
 class MeetingAdmin(admin.ModelAdmin):
     list_display = ("id", "title", "host", "is_active", "created_at", "active_participant_count")
     list_filter = ("is_active",)
-    readonly_fields = ("id", "created_at")
+    readonly_fields = ("id", "created_at", "active_count")  # maintained by DB triggers
 
 
 @admin.register(Participant)
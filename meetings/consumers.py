@@ -29,15 +29,70 @@ Server → Client:
   { type: "meeting_ended" }
   { type: "error",              message }
 """
-import json
+import asyncio
+import functools
+import logging
 
+import orjson
 from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
 from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import connection
+
+from .room_tokens import aroom_token_current
+from .roster import aget_roster, aroster_generation, aset_roster
+
+logger = logging.getLogger(__name__)
+
+
+# Constant frame: serialised once at import instead of on every meeting end.
+_MEETING_ENDED = orjson.dumps({"type": "meeting_ended"})
+
+# Signals are unicast straight to the target's channel. Each connection
+# registers its channel name here; the TTL matches channels_redis' group expiry.
+CHANNEL_TTL = 86400
+
+
+def _channel_key(meeting_id, user_id) -> str:
+    return f"meeting:{meeting_id}:channel:{user_id}"
+
+
+# Frames a client may have queued but not yet received. A client that falls
+# this far behind is closed with 1013 (try again later) instead of buffering more.
+OUTBOX_SIZE = 256
+
+# ICE candidates arrive in bursts of 5-30 per peer. Hold them this long (seconds)
+# and relay each target's burst as a single channel-layer message.
+ICE_BATCH_WINDOW = 0.015
+
+# On meeting end, how long (seconds) to wait for the outbox to flush the
+# meeting_ended frame before closing the socket regardless.
+CLOSE_FLUSH_TIMEOUT = 2.0
+
+
+@functools.lru_cache(maxsize=None)
+def _roster_sql() -> str:
+    # The roster is the hottest query here; precompiled SQL skips building and
+    # compiling an ORM query on every cache miss. Table names come from the
+    # models, so they follow any db_table change.
+    from django.contrib.auth.models import User
+    from .models import Meeting, Participant
+    return (
+        "SELECT p.user_id, u.username"
+        f" FROM {Participant._meta.db_table} p"
+        f" JOIN {User._meta.db_table} u ON u.id = p.user_id"
+        f" JOIN {Meeting._meta.db_table} m ON m.id = p.meeting_id"
+        " WHERE p.meeting_id = %s AND p.is_active AND m.is_active"
+    )
 
 
 class MeetingConsumer(AsyncWebsocketConsumer):
 
+    _ice_flush = None  # pending _flush_ice_later() task, if any
+    _sender = None     # _drain() task that owns all writes to the socket
+    _overflowed = False
+
     # ── Lifecycle ────────────────────────────────────────────────────────────
 
     async def connect(self):
@@ -49,7 +104,22 @@ class MeetingConsumer(AsyncWebsocketConsumer):
             await self.close(code=4001)
             return
 
-        ok = await self._check_access()
+        # Access is proven without a query by a room token from the join view
+        # that no leave/end has revoked since, or by a place on the cached
+        # roster (everyone on it is an active participant of an active
+        # meeting). Anyone else gets the database check.
+        roster = await aget_roster(self.meeting_id)
+        claims = self.scope.get("room_claims")
+        if (claims and claims["mid"] == str(self.meeting_id) and claims["uid"] == self.user.id
+                and await aroom_token_current(claims, self.meeting_id)):
+            ok = True
+        elif roster is not None and any(p["user_id"] == self.user.id for p in roster):
+            ok = True
+        else:
+            # Cold path: one query fetches the roster and answers the check
+            gen = await aroster_generation(self.meeting_id)
+            ok, roster = await self._check_access()
+            await aset_roster(self.meeting_id, gen, roster)
         if not ok:
             await self.close(code=4003)
             return
@@ -57,18 +127,28 @@ class MeetingConsumer(AsyncWebsocketConsumer):
         # Join the meeting group (broadcast channel)
         await self.channel_layer.group_add(self.group_name, self.channel_name)
 
-        # Join a personal group so others can send signals directly to us
-        self.user_group = f"user_{self.user.id}"
-        await self.channel_layer.group_add(self.user_group, self.channel_name)
+        # Register our channel so peers can send signals directly to us
+        self.channel_key = _channel_key(self.meeting_id, self.user.id)
+        await cache.aset(self.channel_key, self.channel_name, CHANNEL_TTL)
+
+        # ICE candidates waiting to be relayed, keyed by target user_id
+        self._ice_buffer = {}
+
+        # Outbound frames are queued and written by one sender task, so group
+        # handlers never wait on this client's socket
+        self._outbox = asyncio.Queue(maxsize=OUTBOX_SIZE)
+        self._sender = asyncio.create_task(self._drain())
 
         await self.accept()
 
         # Send current room state to the new joiner (so they know who's here)
-        participants = await self._get_active_participants()
-        await self.send(json.dumps({
+        participants = await self._get_active_participants(roster)
+        # Peers we may relay signals to; kept current by join/leave events
+        self._known_peers = {p["user_id"] for p in participants}
+        await self._send_json({
             "type": "room_state",
             "participants": participants,
-        }))
+        })
 
         # Broadcast join to everyone else
         await self.channel_layer.group_send(
@@ -76,7 +156,11 @@ class MeetingConsumer(AsyncWebsocketConsumer):
             {
                 "type": "participant.joined",
                 "user_id": self.user.id,
-                "username": self.user.username,
+                "frame": orjson.dumps({
+                    "type": "participant_joined",
+                    "user_id": self.user.id,
+                    "username": self.user.username,
+                }),
             },
         )
 
@@ -84,23 +168,33 @@ class MeetingConsumer(AsyncWebsocketConsumer):
         if not hasattr(self, "group_name"):
             return
 
+        if self._ice_flush is not None:
+            self._ice_flush.cancel()
+        if self._sender is not None:
+            self._sender.cancel()
+
         await self.channel_layer.group_send(
             self.group_name,
             {
                 "type": "participant.left",
                 "user_id": self.user.id,
-                "username": self.user.username,
+                "frame": orjson.dumps({
+                    "type": "participant_left",
+                    "user_id": self.user.id,
+                    "username": self.user.username,
+                }),
             },
         )
         await self.channel_layer.group_discard(self.group_name, self.channel_name)
 
-        if hasattr(self, "user_group"):
-            await self.channel_layer.group_discard(self.user_group, self.channel_name)
+        # A reconnect may already have registered a newer channel; keep it
+        if hasattr(self, "channel_key") and await cache.aget(self.channel_key) == self.channel_name:
+            await cache.adelete(self.channel_key)
 
     async def receive(self, text_data):
         try:
-            data = json.loads(text_data)
-        except json.JSONDecodeError:
+            data = orjson.loads(text_data)
+        except orjson.JSONDecodeError:
             await self._send_error("invalid JSON")
             return
 
@@ -114,9 +208,12 @@ class MeetingConsumer(AsyncWebsocketConsumer):
                 self.group_name,
                 {
                     "type": "chat.message",
-                    "user_id": self.user.id,
-                    "username": self.user.username,
-                    "message": message,
+                    "frame": orjson.dumps({
+                        "type": "chat",
+                        "user_id": self.user.id,
+                        "username": self.user.username,
+                        "message": message,
+                    }),
                 },
             )
 
@@ -125,95 +222,164 @@ class MeetingConsumer(AsyncWebsocketConsumer):
                 self.group_name,
                 {
                     "type": "hand.raise",
-                    "user_id": self.user.id,
-                    "username": self.user.username,
-                    "raised": bool(data.get("raised", False)),
+                    "frame": orjson.dumps({
+                        "type": "hand_raise",
+                        "user_id": self.user.id,
+                        "username": self.user.username,
+                        "raised": bool(data.get("raised", False)),
+                    }),
                 },
             )
 
         elif msg_type == "webrtc_signal":
-            # Unicast: relay only to the target user's personal group
-            to_user_id = data.get("to")
-            if not to_user_id:
+            # Only relay to peers we know are in this meeting; anything else
+            # (including non-integer ids) is dropped without touching the cache
+            try:
+                to_user_id = int(data.get("to"))
+            except (TypeError, ValueError):
                 return
-            await self.channel_layer.group_send(
-                f"user_{to_user_id}",
-                {
-                    "type": "webrtc.relay",
-                    "from_user_id": self.user.id,
-                    "from_username": self.user.username,
-                    "signal": data.get("signal"),
-                },
-            )
+            if to_user_id not in self._known_peers:
+                return
+            signal = data.get("signal")
+            if isinstance(signal, dict) and signal.get("type") == "ice":
+                self._ice_buffer.setdefault(to_user_id, []).append(signal)
+                if self._ice_flush is None:
+                    self._ice_flush = asyncio.create_task(self._flush_ice_later())
+                return
+            # offer/answer go out immediately, behind any ICE already queued
+            # for the same peer so the relative order is preserved
+            signals = self._ice_buffer.pop(to_user_id, [])
+            signals.append(signal)
+            await self._relay_signals(to_user_id, signals)
 
     # ── Group message handlers ────────────────────────────────────────────────
+    # Broadcast events carry a frame serialised once by the sender, so each
+    # of the N recipients just forwards it instead of re-encoding.
 
     async def participant_joined(self, event):
-        await self.send(json.dumps({
-            "type": "participant_joined",
-            "user_id": event["user_id"],
-            "username": event["username"],
-        }))
+        if event["user_id"] != self.user.id:
+            self._known_peers.add(event["user_id"])
+        await self._send_frame(event["frame"])
 
     async def participant_left(self, event):
-        await self.send(json.dumps({
-            "type": "participant_left",
-            "user_id": event["user_id"],
-            "username": event["username"],
-        }))
+        self._known_peers.discard(event["user_id"])
+        await self._send_frame(event["frame"])
 
     async def chat_message(self, event):
-        await self.send(json.dumps({
-            "type": "chat",
-            "user_id": event["user_id"],
-            "username": event["username"],
-            "message": event["message"],
-        }))
+        await self._send_frame(event["frame"])
 
     async def hand_raise(self, event):
-        await self.send(json.dumps({
-            "type": "hand_raise",
-            "user_id": event["user_id"],
-            "username": event["username"],
-            "raised": event["raised"],
-        }))
+        await self._send_frame(event["frame"])
 
     async def webrtc_relay(self, event):
-        # Forward the signal payload to our WebSocket client
-        await self.send(json.dumps({
-            "type": "webrtc_signal",
-            "from": event["from_user_id"],
-            "from_username": event["from_username"],
-            "signal": event["signal"],
-        }))
+        # Forward each batched signal to our WebSocket client as its own frame
+        for signal in event["signals"]:
+            await self._send_json({
+                "type": "webrtc_signal",
+                "from": event["from_user_id"],
+                "from_username": event["from_username"],
+                "signal": signal,
+            })
 
     async def meeting_ended(self, event):
-        await self.send(json.dumps({"type": "meeting_ended"}))
+        await self._send_frame(_MEETING_ENDED)
+        if self._overflowed:  # an overflowed socket is already closed
+            return
+        if not self._sender.done():
+            # let the sender flush it before closing, but never wait on a stuck client
+            try:
+                await asyncio.wait_for(self._outbox.join(), CLOSE_FLUSH_TIMEOUT)
+            except asyncio.TimeoutError:
+                pass
         await self.close()
 
     # ── Helpers ───────────────────────────────────────────────────────────────
 
+    async def _send_frame(self, frame: bytes):
+        if self._overflowed or self._sender.done():
+            return
+        try:
+            self._outbox.put_nowait(frame)
+        except asyncio.QueueFull:
+            self._overflowed = True
+            logger.warning(
+                "closing slow client: user %s in meeting %s has %d frames queued",
+                self.user.id, self.meeting_id, OUTBOX_SIZE,
+            )
+            self._sender.cancel()
+            await self.close(code=1013)
+
+    async def _send_json(self, payload: dict):
+        await self._send_frame(orjson.dumps(payload))
+
+    async def _drain(self):
+        try:
+            while True:
+                frame = await self._outbox.get()
+                # orjson output is already UTF-8; binary frames skip the str round-trip
+                await self.send(bytes_data=frame)
+                self._outbox.task_done()
+        except Exception:
+            # Later frames are dropped by _send_frame; the socket's own close
+            # still ends the consumer
+            logger.warning(
+                "sender stopped: user %s in meeting %s", self.user.id, self.meeting_id,
+                exc_info=True,
+            )
+
+    async def _relay_signals(self, to_user_id, signals: list):
+        # Unicast: relay only to the target user's channel in this meeting
+        target = await cache.aget(_channel_key(self.meeting_id, to_user_id))
+        if target is None:
+            return
+        await self.channel_layer.send(
+            target,
+            {
+                "type": "webrtc.relay",
+                "from_user_id": self.user.id,
+                "from_username": self.user.username,
+                "signals": signals,
+            },
+        )
+
+    async def _flush_ice_later(self):
+        await asyncio.sleep(ICE_BATCH_WINDOW)
+        self._ice_flush = None
+        pending, self._ice_buffer = self._ice_buffer, {}
+        for to_user_id, signals in pending.items():
+            await self._relay_signals(to_user_id, signals)
+
     async def _send_error(self, message: str):
-        await self.send(json.dumps({"type": "error", "message": message}))
+        await self._send_json({"type": "error", "message": message})
 
     @database_sync_to_async
     def _check_access(self):
+        """
+        Returns (allowed, roster) from a single roster query. Only a host who
+        has not been through the join view yet costs a second query.
+        """
         from .models import Meeting
-        meeting = Meeting.objects.filter(id=self.meeting_id, is_active=True).first()
-        if not meeting:
-            return False
-        if meeting.host_id == self.user.id:
-            return True
-        return meeting.participants.filter(user=self.user, is_active=True).exists()
-
-    @database_sync_to_async
-    def _get_active_participants(self):
+        roster = self._read_roster()
+        if any(p["user_id"] == self.user.id for p in roster):
+            return True, roster
+        is_host = Meeting.objects.filter(
+            id=self.meeting_id, is_active=True, host_id=self.user.id
+        ).exists()
+        return is_host, roster
+
+    async def _get_active_participants(self, roster=None):
         """Returns all OTHER active participants in this meeting (not self)."""
-        from .models import Participant
-        parts = (
-            Participant.objects
-            .filter(meeting_id=self.meeting_id, is_active=True)
-            .exclude(user_id=self.user.id)
-            .select_related("user")
-        )
-        return [{"user_id": p.user_id, "username": p.user.username} for p in parts]
+        if roster is None:
+            gen = await aroster_generation(self.meeting_id)
+            roster = await database_sync_to_async(self._read_roster)()
+            await aset_roster(self.meeting_id, gen, roster)
+        return [p for p in roster if p["user_id"] != self.user.id]
+
+    def _read_roster(self):
+        # Active participants of this meeting, if the meeting itself is still active
+        from .models import Meeting
+        meeting_id = Meeting._meta.pk.get_db_prep_value(self.meeting_id, connection)
+        with connection.cursor() as cursor:
+            cursor.execute(_roster_sql(), [meeting_id])
+            rows = cursor.fetchall()
+        return [{"user_id": uid, "username": uname} for uid, uname in rows]
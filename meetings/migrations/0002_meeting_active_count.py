@@ -0,0 +1,34 @@
+# Generated by Django 5.2.11 on 2026-10-15 09:00
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_active_count(apps, schema_editor):
+    Meeting = apps.get_model("meetings", "Meeting")
+    Participant = apps.get_model("meetings", "Participant")
+    active = (
+        Participant.objects
+        .filter(meeting=OuterRef("pk"), is_active=True)
+        .values("meeting")
+        .annotate(n=Count("pk"))
+        .values("n")
+    )
+    Meeting.objects.update(active_count=Coalesce(Subquery(active), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meetings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='meeting',
+            name='active_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_active_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,110 @@
+# Generated by Django 5.2.11 on 2026-10-15 10:00
+
+from django.db import migrations
+
+# Meeting.active_count follows the is_active transitions of its Participant
+# rows. AFTER row triggers keep it in step on every write path (views, admin,
+# cascades); an UPDATE that doesn't change is_active or meeting_id is a no-op.
+
+POSTGRESQL_FORWARD = [
+    """
+    CREATE OR REPLACE FUNCTION meetings_participant_active_count() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            IF NEW.is_active THEN
+                UPDATE meetings_meeting SET active_count = active_count + 1 WHERE id = NEW.meeting_id;
+            END IF;
+        ELSIF TG_OP = 'DELETE' THEN
+            IF OLD.is_active THEN
+                UPDATE meetings_meeting SET active_count = active_count - 1 WHERE id = OLD.meeting_id;
+            END IF;
+        ELSIF OLD.is_active IS DISTINCT FROM NEW.is_active OR OLD.meeting_id <> NEW.meeting_id THEN
+            IF OLD.is_active THEN
+                UPDATE meetings_meeting SET active_count = active_count - 1 WHERE id = OLD.meeting_id;
+            END IF;
+            IF NEW.is_active THEN
+                UPDATE meetings_meeting SET active_count = active_count + 1 WHERE id = NEW.meeting_id;
+            END IF;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER meetings_participant_active_count
+    AFTER INSERT OR UPDATE OF is_active, meeting_id OR DELETE ON meetings_participant
+    FOR EACH ROW EXECUTE FUNCTION meetings_participant_active_count()
+    """,
+]
+POSTGRESQL_REVERSE = [
+    "DROP TRIGGER IF EXISTS meetings_participant_active_count ON meetings_participant",
+    "DROP FUNCTION IF EXISTS meetings_participant_active_count()",
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE TRIGGER meetings_participant_active_count_ai
+    AFTER INSERT ON meetings_participant WHEN NEW.is_active
+    BEGIN
+        UPDATE meetings_meeting SET active_count = active_count + 1 WHERE id = NEW.meeting_id;
+    END
+    """,
+    """
+    CREATE TRIGGER meetings_participant_active_count_ad
+    AFTER DELETE ON meetings_participant WHEN OLD.is_active
+    BEGIN
+        UPDATE meetings_meeting SET active_count = active_count - 1 WHERE id = OLD.meeting_id;
+    END
+    """,
+    """
+    CREATE TRIGGER meetings_participant_active_count_au
+    AFTER UPDATE OF is_active, meeting_id ON meetings_participant
+    WHEN OLD.is_active IS NOT NEW.is_active OR OLD.meeting_id IS NOT NEW.meeting_id
+    BEGIN
+        UPDATE meetings_meeting SET active_count = active_count - OLD.is_active WHERE id = OLD.meeting_id;
+        UPDATE meetings_meeting SET active_count = active_count + NEW.is_active WHERE id = NEW.meeting_id;
+    END
+    """,
+]
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS meetings_participant_active_count_ai",
+    "DROP TRIGGER IF EXISTS meetings_participant_active_count_ad",
+    "DROP TRIGGER IF EXISTS meetings_participant_active_count_au",
+]
+
+TRIGGER_SQL = {
+    "postgresql": (POSTGRESQL_FORWARD, POSTGRESQL_REVERSE),
+    "sqlite": (SQLITE_FORWARD, SQLITE_REVERSE),
+}
+
+RECOUNT_SQL = """
+    UPDATE meetings_meeting SET active_count = (
+        SELECT COUNT(*) FROM meetings_participant p
+        WHERE p.meeting_id = meetings_meeting.id AND p.is_active
+    )
+"""
+
+
+def create_triggers(apps, schema_editor):
+    forward, _ = TRIGGER_SQL[schema_editor.connection.vendor]
+    for sql in forward:
+        schema_editor.execute(sql)
+    # Start the triggers from an exact count
+    schema_editor.execute(RECOUNT_SQL)
+
+
+def drop_triggers(apps, schema_editor):
+    _, reverse = TRIGGER_SQL[schema_editor.connection.vendor]
+    for sql in reverse:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('meetings', '0002_meeting_active_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_triggers, drop_triggers),
+    ]
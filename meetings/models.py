@@ -17,6 +17,9 @@ class Meeting(models.Model):
     ended_at = models.DateTimeField(null=True, blank=True)
     is_active = models.BooleanField(default=True)
     max_participants = models.PositiveIntegerField(default=20)
+    # Active Participant rows, kept in step by database triggers on the
+    # participant table (migration 0003) so reads never need a COUNT
+    active_count = models.PositiveIntegerField(default=0)
 
     class Meta:
         ordering = ["-created_at"]
@@ -26,7 +29,7 @@ class Meeting(models.Model):
 
     @property
     def active_participant_count(self):
-        return self.participants.filter(is_active=True).count()
+        return self.active_count
 
 
 class Participant(models.Model):
@@ -0,0 +1,49 @@
+"""
+Short-lived signed room tokens.
+
+MeetingJoinView has already checked that the caller may be in the meeting, so
+it hands back a room token. The browser presents it on the WebSocket connect
+as ?room_token=<token>, letting MeetingConsumer admit the socket without
+repeating the access queries. Signed with SECRET_KEY via django.core.signing.
+
+Leaving or ending a meeting revokes the room's outstanding tokens: each token
+carries the meeting's token epoch from when it was issued, and
+revoke_room_tokens() replaces that epoch. A revoked token no longer admits the
+socket on its own; the consumer falls back to its roster/database check.
+"""
+import secrets
+
+from django.core import signing
+from django.core.cache import cache
+
+ROOM_TOKEN_MAX_AGE = 120  # seconds; covers the camera prompt between join and connect
+_SALT = "meetings.room_token"
+
+
+def _epoch_key(meeting_id) -> str:
+    return f"meeting:{meeting_id}:room_token_epoch"
+
+
+def issue_room_token(meeting_id, user_id, role: str) -> str:
+    epoch = cache.get(_epoch_key(meeting_id))
+    return signing.dumps(
+        {"mid": str(meeting_id), "uid": user_id, "role": role, "ep": epoch}, salt=_SALT
+    )
+
+
+def revoke_room_tokens(meeting_id):
+    # Outlives every token issued before it, so an expired epoch can't revive one
+    cache.set(_epoch_key(meeting_id), secrets.token_hex(8), ROOM_TOKEN_MAX_AGE)
+
+
+async def aroom_token_current(claims, meeting_id) -> bool:
+    """False once the meeting has seen a leave/end since the token was issued."""
+    return claims.get("ep") == await cache.aget(_epoch_key(meeting_id))
+
+
+def read_room_token(token: str):
+    """Returns the token's claims, or None if it is forged or expired."""
+    try:
+        return signing.loads(token, salt=_SALT, max_age=ROOM_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return None
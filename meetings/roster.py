@@ -0,0 +1,57 @@
+"""
+Per-meeting roster cache.
+
+The WebSocket consumer sends a `room_state` snapshot on every connect, so a
+join storm in a busy room would otherwise hit the database once per joiner.
+The active-participant list is cached under `meeting:<id>:roster` and dropped
+by the REST views whenever they change who is active in the meeting.
+
+Because the consumer also admits sockets from the cached roster, a write must
+never restore a list that an invalidation has already dropped. Each cached
+roster is therefore tagged with the meeting's roster generation, a random
+token that invalidate_roster() replaces. The consumer takes the generation
+before reading the database and readers ignore a roster whose tag no longer
+matches, so a write-back that loses the race to a leave/end is never used.
+
+Backed by Django's cache framework: Redis in production, local memory in dev.
+"""
+import secrets
+
+from django.core.cache import cache
+
+ROSTER_TTL = 300  # seconds; bounds staleness if an invalidation is ever missed
+
+
+def roster_key(meeting_id) -> str:
+    return f"meeting:{meeting_id}:roster"
+
+
+def roster_gen_key(meeting_id) -> str:
+    return f"meeting:{meeting_id}:roster_gen"
+
+
+def invalidate_roster(meeting_id):
+    # A fresh generation orphans any roster a consumer is about to write back
+    cache.set(roster_gen_key(meeting_id), secrets.token_hex(8), ROSTER_TTL)
+    cache.delete(roster_key(meeting_id))
+
+
+async def aget_roster(meeting_id):
+    """The cached roster, or None if absent or older than the last invalidation."""
+    key, gen_key = roster_key(meeting_id), roster_gen_key(meeting_id)
+    found = await cache.aget_many([key, gen_key])
+    entry, gen = found.get(key), found.get(gen_key)
+    if entry is None or gen is None or entry[0] != gen:
+        return None
+    return entry[1]
+
+
+async def aroster_generation(meeting_id):
+    """Current generation; take it BEFORE reading the roster from the database."""
+    gen_key = roster_gen_key(meeting_id)
+    await cache.aadd(gen_key, secrets.token_hex(8), ROSTER_TTL)
+    return await cache.aget(gen_key)
+
+
+async def aset_roster(meeting_id, gen, roster):
+    await cache.aset(roster_key(meeting_id), (gen, roster), ROSTER_TTL)
@@ -2,19 +2,49 @@
 SFU token service — abstraction layer over the media provider.
 
 To swap providers, implement the same interface here.
-Current implementation: LiveKit (livekit-api Python SDK).
+Current implementation: LiveKit. Its access token is a plain HS256 JWT
+(https://docs.livekit.io/home/get-started/authentication/), signed here
+directly so each join costs one HMAC over the claims.
 
 Alternatives you could drop in:
   - Twilio Video: use twilio.jwt.access_token.AccessToken + VideoGrant
   - Daily.co: POST https://api.daily.co/v1/meeting-tokens (HTTP API)
   - Agora: use agora_token_builder.RtcTokenBuilder
 """
+import base64
+import hashlib
+import hmac
+import time
+
+import orjson
 from django.conf import settings
 
+SFU_TOKEN_TTL = 6 * 60 * 60  # seconds; LiveKit SDK default
+
+# JOSE header is the same for every token
+_JWT_HEADER = base64.urlsafe_b64encode(orjson.dumps({"alg": "HS256", "typ": "JWT"})).rstrip(b"=")
+
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
 
 class SFUTokenService:
-    @staticmethod
+    # HMAC keyed with LIVEKIT_API_SECRET, built on first use; copy() reuses its
+    # precomputed key pads so signing skips the key setup
+    _signer = None
+
+    @classmethod
+    def _sign(cls, signing_input: bytes) -> bytes:
+        if cls._signer is None:
+            cls._signer = hmac.new(settings.LIVEKIT_API_SECRET.encode(), digestmod=hashlib.sha256)
+        mac = cls._signer.copy()
+        mac.update(signing_input)
+        return mac.digest()
+
+    @classmethod
     def generate_token(
+        cls,
         room_name: str,
         participant_identity: str,
         participant_name: str,
@@ -25,26 +55,26 @@ class SFUTokenService:
         room_name     — meeting UUID string
         identity      — user.id as string (must be unique per room)
         name          — display name shown in the room
-        is_host       — grants room_admin (can mute/remove others)
+        is_host       — grants roomAdmin (can mute/remove others)
         """
-        from livekit.api import AccessToken, VideoGrants
-
-        grants = VideoGrants(
-            room_join=True,
-            room=room_name,
-            can_publish=True,
-            can_subscribe=True,
-            can_publish_data=True,   # data channel (chat via LiveKit, optional)
-            room_admin=is_host,      # host can call admin RPC
-        )
-
-        token = (
-            AccessToken(settings.LIVEKIT_API_KEY, settings.LIVEKIT_API_SECRET)
-            .with_identity(participant_identity)
-            .with_name(participant_name)
-            .with_grants(grants)
-        )
-        return token.to_jwt()
+        now = int(time.time())
+        claims = {
+            "name": participant_name,
+            "video": {
+                "roomAdmin": is_host,      # host can call admin RPC
+                "roomJoin": True,
+                "room": room_name,
+                "canPublish": True,
+                "canSubscribe": True,
+                "canPublishData": True,    # data channel (chat via LiveKit, optional)
+            },
+            "sub": participant_identity,
+            "iss": settings.LIVEKIT_API_KEY,
+            "nbf": now,
+            "exp": now + SFU_TOKEN_TTL,
+        }
+        signing_input = _JWT_HEADER + b"." + _b64url(orjson.dumps(claims))
+        return (signing_input + b"." + _b64url(cls._sign(signing_input))).decode()
 
     @staticmethod
     def get_server_url() -> str:
@@ -0,0 +1,97 @@
+"""
+Run with the dev settings (SQLite, in-memory channel layer and cache):
+  python manage.py test meetings --settings=meetingapp.settings_dev
+"""
+from unittest import mock
+
+from channels.db import database_sync_to_async
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TransactionTestCase
+
+from meetingapp.routing import websocket_urlpatterns
+
+from .consumers import MeetingConsumer
+from .models import Meeting, Participant
+from .room_tokens import issue_room_token, read_room_token, revoke_room_tokens
+from .roster import invalidate_roster
+
+application = URLRouter(websocket_urlpatterns)
+
+
+class MeetingConsumerAccessTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.host = User.objects.create_user("host", password="password1")
+        self.bob = User.objects.create_user("bob", password="password1")
+        self.carol = User.objects.create_user("carol", password="password1")
+        self.meeting = Meeting.objects.create(host=self.host, title="Standup")
+        Participant.objects.create(meeting=self.meeting, user=self.host, role=Participant.ROLE_HOST)
+        Participant.objects.create(meeting=self.meeting, user=self.bob)
+        Participant.objects.create(meeting=self.meeting, user=self.carol)
+
+    def _communicator(self, user, room_claims=None):
+        communicator = WebsocketCommunicator(application, f"/ws/meeting/{self.meeting.id}/")
+        communicator.scope["user"] = user
+        communicator.scope["room_claims"] = room_claims
+        return communicator
+
+    def _leave(self, user):
+        # What MeetingLeaveView does for a non-host
+        Participant.objects.filter(meeting=self.meeting, user=user).update(is_active=False)
+        revoke_room_tokens(self.meeting.id)
+        invalidate_roster(self.meeting.id)
+
+    async def _group_send(self, message):
+        await get_channel_layer().group_send(f"meeting_{self.meeting.id}", message)
+
+    def _room_claims(self, user):
+        return read_room_token(issue_room_token(self.meeting.id, user.id, Participant.ROLE_PARTICIPANT))
+
+    async def test_leave_between_roster_read_and_cache_write_is_not_admitted(self):
+        read_roster = MeetingConsumer._read_roster
+
+        def read_then_leave(consumer):
+            roster = read_roster(consumer)
+            self._leave(self.bob)  # lands after the read, before the consumer caches it
+            return roster
+
+        with mock.patch.object(MeetingConsumer, "_read_roster", read_then_leave):
+            carol = self._communicator(self.carol)
+            connected, _ = await carol.connect()
+            self.assertTrue(connected)
+
+        bob = self._communicator(self.bob)
+        connected, code = await bob.connect()
+        self.assertFalse(connected)
+        self.assertEqual(code, 4003)
+        await carol.disconnect()
+
+    async def test_room_token_admits_without_access_check(self):
+        bob = self._communicator(self.bob, self._room_claims(self.bob))
+        with mock.patch.object(MeetingConsumer, "_check_access") as check_access:
+            connected, _ = await bob.connect()
+        self.assertTrue(connected)
+        check_access.assert_not_called()
+        await bob.disconnect()
+
+    async def test_room_token_is_revoked_by_leave(self):
+        claims = self._room_claims(self.bob)
+        await database_sync_to_async(self._leave)(self.bob)
+        bob = self._communicator(self.bob, claims)
+        connected, code = await bob.connect()
+        self.assertFalse(connected)
+        self.assertEqual(code, 4003)
+
+    async def test_meeting_end_closes_socket_after_sender_died(self):
+        bob = self._communicator(self.bob)
+        with mock.patch.object(MeetingConsumer, "send", side_effect=OSError("connection reset")):
+            connected, _ = await bob.connect()
+            self.assertTrue(connected)
+            await bob.send_input({"type": "websocket.receive", "text": "{}"})  # room_state write has failed by now
+            await self._group_send({"type": "meeting.ended"})
+            closed = await bob.receive_output()
+        self.assertEqual(closed["type"], "websocket.close")
@@ -1,5 +1,13 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, F, OuterRef, Q
+from django.http import HttpResponse
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -7,12 +15,68 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from meetingapp.renderers import ORJSONRenderer
+
 from .models import Meeting, Participant
+from .room_tokens import issue_room_token, revoke_room_tokens
+from .roster import invalidate_roster
 from .services import SFUTokenService
 
+# Static for the life of the process — read once instead of on every join
+_SFU_URL = SFUTokenService.get_server_url()
+
+# Encoder for responses built without DRF's Response (see ORJSONRenderer for how it
+# differs from DRF's JSONRenderer)
+_JSON = ORJSONRenderer()
+
+# The meeting list reads from the replica when one is configured. Views that
+# make access decisions (participants, join/leave/end) stay on the primary.
+READ_DB = "replica" if "replica" in settings.DATABASES else "default"
+
+# Hot-meeting host cache: meeting_id -> (host_id, expires_at).
+# Lets MeetingParticipantsView decide access without fetching the Meeting row.
+# Per process; entries are dropped here when a meeting ends and otherwise
+# expire after _HOST_CACHE_TTL seconds. Sync views may run on several threads.
+_HOST_CACHE_MAX = 10_000
+_HOST_CACHE_TTL = 60
+_host_cache = OrderedDict()
+_host_cache_lock = threading.Lock()
+
+
+def _host_id_for(meeting_id):
+    """host_id of the meeting, or None if it doesn't exist."""
+    with _host_cache_lock:
+        entry = _host_cache.get(meeting_id)
+        if entry is not None and entry[1] > time.time():
+            _host_cache.move_to_end(meeting_id)
+            return entry[0]
+    try:
+        host_id = Meeting.objects.values_list("host_id", flat=True).get(id=meeting_id)
+    except Meeting.DoesNotExist:
+        return None
+    with _host_cache_lock:
+        _host_cache[meeting_id] = (host_id, time.time() + _HOST_CACHE_TTL)
+        _host_cache.move_to_end(meeting_id)
+        if len(_host_cache) > _HOST_CACHE_MAX:
+            _host_cache.popitem(last=False)
+    return host_id
+
+
+def _forget_host(meeting_id):
+    with _host_cache_lock:
+        _host_cache.pop(meeting_id, None)
+
 
 # ─── Auth ────────────────────────────────────────────────────────────────────
 
+def _refresh_token_for(user):
+    # username rides in the claims (and is copied into every access token) so
+    # the WebSocket middleware can build scope["user"] without a User fetch
+    refresh = RefreshToken.for_user(user)
+    refresh["username"] = user.username
+    return refresh
+
+
 class RegisterView(APIView):
     permission_classes = [AllowAny]
 
@@ -27,11 +91,13 @@ class RegisterView(APIView):
         if len(password) < 8:
             return Response({"error": "password must be at least 8 characters"}, status=400)
 
-        if User.objects.filter(username=username).exists():
+        # The unique constraint on username does the existence check
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(username=username, email=email, password=password)
+        except IntegrityError:
             return Response({"error": "username already taken"}, status=400)
-
-        user = User.objects.create_user(username=username, email=email, password=password)
-        refresh = RefreshToken.for_user(user)
+        refresh = _refresh_token_for(user)
         return Response(
             {
                 "user": {"id": user.id, "username": user.username},
@@ -52,7 +118,7 @@ class LoginView(APIView):
         if not user:
             return Response({"error": "invalid credentials"}, status=401)
 
-        refresh = RefreshToken.for_user(user)
+        refresh = _refresh_token_for(user)
         return Response(
             {
                 "user": {"id": user.id, "username": user.username},
@@ -72,18 +138,16 @@ class MeetingListCreateView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        meetings = Meeting.objects.filter(host=request.user, is_active=True)
-        return Response(
-            [
-                {
-                    "id": str(m.id),
-                    "title": m.title,
-                    "created_at": m.created_at,
-                    "active_participants": m.active_participant_count,
-                }
-                for m in meetings
-            ]
+        # One query, plain dicts: active participants come from Meeting.active_count.
+        # The rows go straight to orjson — DRF's Response/negotiation is skipped,
+        # the body is identical to what the default renderer would produce.
+        meetings = list(
+            Meeting.objects
+            .using(READ_DB)
+            .filter(host=request.user, is_active=True)
+            .values("id", "title", "created_at", active_participants=F("active_count"))
         )
+        return HttpResponse(_JSON.render(meetings), content_type=_JSON.media_type)
 
     def post(self, request):
         title = request.data.get("title", "Untitled Meeting").strip()[:255]
@@ -99,38 +163,59 @@ class MeetingJoinView(APIView):
     POST /api/meetings/<id>/join/
 
     1. Validates the meeting exists and is active.
-    2. Enforces participant cap.
+    2. Enforces participant cap with a conditional UPDATE on active_count.
     3. Creates/re-activates the Participant record.
     4. Issues a LiveKit SFU token scoped to this room.
-    5. Returns token + LiveKit server URL so the browser can connect directly.
+    5. Returns token + LiveKit server URL so the browser can connect directly,
+       plus a room token that lets the WebSocket connect skip the access check.
     """
     permission_classes = [IsAuthenticated]
 
     def post(self, request, meeting_id):
         try:
-            meeting = Meeting.objects.get(id=meeting_id, is_active=True)
-        except (Meeting.DoesNotExist, ValueError):
+            meeting = Meeting.objects.only("id", "title", "host_id").get(id=meeting_id, is_active=True)
+        except Meeting.DoesNotExist:
             return Response({"error": "meeting not found"}, status=404)
 
-        # Check cap (host doesn't count against the limit)
-        active_count = meeting.participants.filter(is_active=True).count()
-        is_host = meeting.host == request.user
-        if not is_host and active_count >= meeting.max_participants:
-            return Response({"error": "meeting is full"}, status=403)
-
-        # Upsert participant record
+        is_host = meeting.host_id == request.user.id
         role = Participant.ROLE_HOST if is_host else Participant.ROLE_PARTICIPANT
-        participant, created = Participant.objects.get_or_create(
-            meeting=meeting,
-            user=request.user,
-            defaults={"role": role, "is_active": True},
+
+        # Claim the meeting row with one conditional UPDATE so the cap is enforced
+        # in SQL (host doesn't count against the limit). A user who is already
+        # active keeps their seat instead of being refused. The UPDATE writes
+        # nothing new: active_count is moved by the participant triggers
+        # (migration 0003) when the upsert below activates a row.
+        already_in = Exists(
+            Participant.objects.filter(meeting=OuterRef("pk"), user=request.user, is_active=True)
         )
-        if not created:
-            # Rejoin: reset state
-            participant.is_active = True
-            participant.left_at = None
-            participant.joined_at = timezone.now()
-            participant.save()
+        seat = Meeting.objects.filter(id=meeting.id, is_active=True)
+        if not is_host:
+            seat = seat.filter(Q(active_count__lt=F("max_participants")) | already_in)
+
+        # The UPDATE holds the meeting row lock until the upsert below commits
+        with transaction.atomic():
+            seated = seat.update(active_count=F("active_count"))
+            if not seated:
+                return Response({"error": "meeting is full"}, status=403)
+
+            # Upsert participant record in one INSERT ... ON CONFLICT statement.
+            # Rejoin resets state but keeps the role from the first join.
+            Participant.objects.bulk_create(
+                [
+                    Participant(
+                        meeting=meeting,
+                        user=request.user,
+                        role=role,
+                        is_active=True,
+                        left_at=None,
+                        joined_at=timezone.now(),
+                    )
+                ],
+                update_conflicts=True,
+                unique_fields=["meeting", "user"],
+                update_fields=["is_active", "left_at", "joined_at"],
+            )
+        invalidate_roster(meeting.id)
 
         # Generate SFU token — browser sends this directly to LiveKit
         sfu_token = SFUTokenService.generate_token(
@@ -146,7 +231,8 @@ class MeetingJoinView(APIView):
                 "title": meeting.title,
                 "is_host": is_host,
                 "sfu_token": sfu_token,       # browser passes to LiveKit SDK
-                "sfu_url": SFUTokenService.get_server_url(),  # LiveKit WS URL
+                "sfu_url": _SFU_URL,          # LiveKit WS URL
+                "room_token": issue_room_token(meeting.id, request.user.id, role),  # WS ?room_token=
             }
         )
 
@@ -161,27 +247,37 @@ class MeetingLeaveView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, meeting_id):
-        try:
-            meeting = Meeting.objects.get(id=meeting_id)
-        except (Meeting.DoesNotExist, ValueError):
-            return Response({"error": "meeting not found"}, status=404)
-
-        # Mark participant as left
-        Participant.objects.filter(
-            meeting=meeting, user=request.user, is_active=True
-        ).update(is_active=False, left_at=timezone.now())
-
-        # If host leaves → end meeting, kick everyone
-        if meeting.host == request.user:
-            meeting.is_active = False
-            meeting.ended_at = timezone.now()
-            meeting.save()
-            Participant.objects.filter(meeting=meeting, is_active=True).update(
-                is_active=False, left_at=timezone.now()
-            )
-            return Response({"status": "meeting ended"})
-
-        return Response({"status": "left"})
+        # The meeting row stays locked until commit so joins can't slip in
+        # between the participant and meeting updates
+        with transaction.atomic():
+            try:
+                meeting = Meeting.objects.select_for_update().only(
+                    "id", "host_id", "is_active", "ended_at"
+                ).get(id=meeting_id)
+            except Meeting.DoesNotExist:
+                return Response({"error": "meeting not found"}, status=404)
+
+            now = timezone.now()
+            ended = meeting.host_id == request.user.id
+            if ended:
+                # Host leaves → end meeting, kick everyone (host's own row included)
+                Participant.objects.filter(meeting=meeting, is_active=True).update(
+                    is_active=False, left_at=now
+                )
+                meeting.is_active = False
+                meeting.ended_at = now
+                meeting.save(update_fields=["is_active", "ended_at"])
+            else:
+                # Mark participant as left
+                Participant.objects.filter(
+                    meeting=meeting, user=request.user, is_active=True
+                ).update(is_active=False, left_at=now)
+
+        if ended:
+            _forget_host(meeting.id)
+        revoke_room_tokens(meeting.id)
+        invalidate_roster(meeting.id)
+        return Response({"status": "meeting ended" if ended else "left"})
 
 
 class MeetingParticipantsView(APIView):
@@ -193,32 +289,24 @@ class MeetingParticipantsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, meeting_id):
-        try:
-            meeting = Meeting.objects.get(id=meeting_id)
-        except (Meeting.DoesNotExist, ValueError):
+        host_id = _host_id_for(meeting_id)
+        if host_id is None:
             return Response({"error": "meeting not found"}, status=404)
 
-        # Access check: must be host or active participant
-        is_host = meeting.host == request.user
-        is_participant = meeting.participants.filter(
-            user=request.user, is_active=True
-        ).exists()
+        participants = list(
+            Participant.objects
+            .filter(meeting_id=meeting_id, is_active=True)
+            .values("user_id", "role", "joined_at", username=F("user__username"))
+        )
+
+        # Access check: must be host or active participant (decided from the rows above)
+        is_host = host_id == request.user.id
+        is_participant = any(p["user_id"] == request.user.id for p in participants)
 
         if not is_host and not is_participant:
             return Response({"error": "forbidden"}, status=403)
 
-        participants = meeting.participants.filter(is_active=True).select_related("user")
-        return Response(
-            [
-                {
-                    "user_id": p.user.id,
-                    "username": p.user.username,
-                    "role": p.role,
-                    "joined_at": p.joined_at,
-                }
-                for p in participants
-            ]
-        )
+        return Response(participants)
 
 
 class MeetingEndView(APIView):
@@ -228,19 +316,29 @@ class MeetingEndView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, meeting_id):
-        try:
-            meeting = Meeting.objects.get(id=meeting_id, host=request.user)
-        except (Meeting.DoesNotExist, ValueError):
-            return Response({"error": "not found or not your meeting"}, status=404)
-
-        if not meeting.is_active:
-            return Response({"error": "meeting already ended"}, status=400)
-
-        meeting.is_active = False
-        meeting.ended_at = timezone.now()
-        meeting.save()
+        # Lock the meeting row before touching participants — the same order
+        # as join (seat UPDATE, then upsert) and leave, so a racing rejoin
+        # waits instead of deadlocking against the active_count triggers
+        with transaction.atomic():
+            try:
+                meeting = Meeting.objects.select_for_update().only(
+                    "id", "is_active", "ended_at"
+                ).get(id=meeting_id, host=request.user)
+            except Meeting.DoesNotExist:
+                return Response({"error": "not found or not your meeting"}, status=404)
+
+            if not meeting.is_active:
+                return Response({"error": "meeting already ended"}, status=400)
+
+            now = timezone.now()
+            Participant.objects.filter(meeting=meeting, is_active=True).update(
+                is_active=False, left_at=now
+            )
+            meeting.is_active = False
+            meeting.ended_at = now
+            meeting.save(update_fields=["is_active", "ended_at"])
 
-        Participant.objects.filter(meeting=meeting, is_active=True).update(
-            is_active=False, left_at=timezone.now()
-        )
+        _forget_host(meeting.id)
+        revoke_room_tokens(meeting.id)
+        invalidate_roster(meeting.id)
         return Response({"status": "ended"})